@@ -1,11 +1,115 @@
 
 import os
+import warnings
 import numpy as np
 import matplotlib.pyplot as plt
-import copy
+
+try:
+    from numba import njit
+except ImportError:
+    # fall back to the pure-Python implementation when numba is unavailable
+    def njit(func=None, **kwargs):
+        if func is None:
+            def wrapper(f): return f
+            return wrapper
+        return func
 
 datadir='/home/leon/code/CPSPy'
 
+_ak135Arr   = None
+
+def _load_ak135():
+    """
+    Load the ak135 database, caching the parsed array so repeated calls skip disk I/O and ASCII parsing
+    """
+    global _ak135Arr
+    if _ak135Arr is None:
+        if os.path.isfile(datadir+'/ak135_dbase.txt'):
+            txtfname    = datadir+'/ak135_dbase.txt'
+        else:
+            txtfname    = os.path.join(os.path.dirname(__file__), 'ak135_dbase.txt')
+        # keep a binary sibling of the ASCII table: np.load skips the
+        # float tokenizer entirely on every run after the first
+        npyfname    = os.path.splitext(txtfname)[0]+'.npy'
+        if os.path.isfile(npyfname) and os.path.getmtime(npyfname) >= os.path.getmtime(txtfname):
+            _ak135Arr   = np.load(npyfname)
+        else:
+            _ak135Arr   = np.loadtxt(txtfname)
+            try:
+                np.save(npyfname, _ak135Arr)
+            except (IOError, OSError):
+                pass    # read-only install; fall back to parsing each run
+    return _ak135Arr
+
+
+def _brocher_vp(vs):
+    """
+    Brocher-crust vp(vs) relation in Horner form, for scalar or array input
+    """
+    return 0.9409+vs*(2.0947+vs*(-0.8206+vs*(0.2683+vs*(-0.0251))))
+
+
+def _brocher_rho(vp):
+    """
+    Brocher-crust rho(vp) relation in Horner form, for scalar or array input
+    """
+    return vp*(1.6612+vp*(-0.4721+vp*(0.0671+vp*(-0.0043+vp*0.000106))))
+
+
+@njit
+def _brocher_fill(vsArr, vpArr, rhoArr):
+    """
+    Fill missing (NaN) vp/rho entries with the Brocher-crust relations, in place
+    """
+    for i in range(vsArr.size):
+        if np.isnan(vpArr[i]):
+            vs          = vsArr[i]
+            vpArr[i]    = 0.9409+vs*(2.0947+vs*(-0.8206+vs*(0.2683+vs*(-0.0251))))
+        if np.isnan(rhoArr[i]):
+            vp          = vpArr[i]
+            rhoArr[i]   = vp*(1.6612+vp*(-0.4721+vp*(0.0671+vp*(-0.0043+vp*0.000106))))
+    return
+
+
+@njit
+def _scale_column(data, col, i0, i1, scale):
+    """
+    Scale rows [i0, i1) of one column of the layer-parameter matrix in place
+    """
+    data[i0:i1, col] *= scale
+    return
+
+
+def _vpf(vp, vs):
+    """
+    Get the constructed velocity related to the F modulus, for scalar or array input
+    """
+    return np.sqrt(vp**2 - 2.*vs**2)
+
+
+def _layerparam(name):
+    """
+    Expose one column of the layer-parameter matrix (Model1d._data) as an attribute.
+    The getter returns a view, so in-place operations (e.g. model.VsArr[:10] *= 1.1)
+    write straight into the matrix; full-array assignment requires matching length.
+    """
+    def fget(self):
+        try:
+            ind = self._cols[name]
+        except KeyError:
+            raise AttributeError('%s model has no parameter %s' %(self.modeltype, name))
+        return self._data[:, ind]
+    def fset(self, value):
+        try:
+            ind = self._cols[name]
+        except KeyError:
+            raise AttributeError('%s model has no parameter %s' %(self.modeltype, name))
+        value   = np.asarray(value, dtype=float)
+        if value.size != self._data.shape[0]:
+            raise ValueError('Size mismatch when assigning '+name+', use getmodel/addlayers to resize the model!')
+        self._data[:, ind]  = value
+    return property(fget, fset)
+
 
 class Model1d(object):
     """
@@ -26,17 +130,54 @@ class Model1d(object):
     VsvArr, VpvArr, VshArr, VphArr, VpfArr, rhoArr, QpArr, QsArr, etapArr, etasArr, frefpArr,  frefsArr
                     - model parameters (TI)                
     DepthArr        - depth array (bottom depth of each layer)
+    topArr          - top depth of each layer, cached alongside DepthArr
     ===========================================================================================================
+    Internally the layer parameters are stored as one contiguous 2D ndarray (self._data)
+    of shape (Nlayer, Nparam); the *Arr attributes above are column views into it.
     """
+    # column layout of the layer-parameter matrix for each model type
+    _COLS_ISO   = {'HArr': 0, 'VpArr': 1, 'VsArr': 2, 'rhoArr': 3, 'QpArr': 4, 'QsArr': 5,
+                    'etapArr': 6, 'etasArr': 7, 'frefpArr': 8, 'frefsArr': 9}
+    _COLS_TI    = {'HArr': 0, 'VpvArr': 1, 'VsvArr': 2, 'VphArr': 3, 'VshArr': 4, 'VpfArr': 5,
+                    'rhoArr': 6, 'QpArr': 7, 'QsArr': 8, 'etapArr': 9, 'etasArr': 10, 'frefpArr': 11, 'frefsArr': 12}
+    # perturb datatype -> (attribute to scale, matching addlayer keyword)
+    _PERTURB_MAP= {'vp': ('VpArr', 'vpv'), 'vs': ('VsArr', 'vsv'),
+                    'vpv': ('VpvArr', 'vpv'), 'vsv': ('VsvArr', 'vsv'), 'vph': ('VphArr', 'vph'),
+                    'vsh': ('VshArr', 'vsh'), 'vpf': ('VpfArr', 'vpf'),
+                    'rho': ('rhoArr', 'rho'), 'qp': ('QpArr', 'Qp'), 'qs': ('QsArr', 'Qs'),
+                    'etap': ('etapArr', 'etap'), 'etas': ('etasArr', 'etas'),
+                    'frefp': ('frefpArr', 'frefp'), 'frefs': ('frefsArr', 'frefs')}
+    HArr        = _layerparam('HArr')
+    VpArr       = _layerparam('VpArr')
+    VsArr       = _layerparam('VsArr')
+    VpvArr      = _layerparam('VpvArr')
+    VsvArr      = _layerparam('VsvArr')
+    VphArr      = _layerparam('VphArr')
+    VshArr      = _layerparam('VshArr')
+    VpfArr      = _layerparam('VpfArr')
+    rhoArr      = _layerparam('rhoArr')
+    QpArr       = _layerparam('QpArr')
+    QsArr       = _layerparam('QsArr')
+    etapArr     = _layerparam('etapArr')
+    etasArr     = _layerparam('etasArr')
+    frefpArr    = _layerparam('frefpArr')
+    frefsArr    = _layerparam('frefsArr')
+
+    def __new__(cls, *args, **kwargs):
+        # dispatch to the type-specialized subclass, so per-call string
+        # compares on modeltype become ordinary method overrides
+        if cls is Model1d:
+            modelindex  = kwargs.get('modelindex', args[2] if len(args) > 2 else 1)
+            cls         = TIModel1d if modelindex == 2 else IsotropicModel1d
+        return object.__new__(cls)
+
     def __init__(self, modelver='MODEL.01', modelname='TEST MODEL', modelindex=1, modelunit='KGS', earthindex=2,
             boundaryindex=1, Vindex=1, HArr=np.array([]), VsArr=np.array([]), VpArr=np.array([]), rhoArr=np.array([]),
             QpArr=np.array([]), QsArr=np.array([]), etapArr=np.array([]), etasArr=np.array([]), frefpArr=np.array([]),  frefsArr=np.array([])):
         self.modelver   = modelver
         self.modelname  = modelname
-        modeldict       = {1: 'ISOTROPIC', 2: 'TRANSVERSE ISOTROPIC', 3: 'ANISOTROPIC'}
         if modelindex != 1 and modelindex != 2:
             raise ValueError('Error in model index, currently only support 1 : ISOTROPIC and 2: TRANSVERSE ISOTROPIC')
-        self.modeltype  = modeldict[modelindex]
         self.modelunit  = modelunit
         earthdict       = {1: 'FLAT EARTH', 2:'SPHERICAL EARTH'}
         self.earthtype  = earthdict[earthindex]
@@ -45,62 +186,119 @@ class Model1d(object):
         Vdict           = {1: 'CONSTANT VELOCITY', 2: 'VARIABLE VELOCITY'}
         self.Vtype      = Vdict[Vindex]
         self.line08_11  = 'LINE08\nLINE09\nLINE10\nLINE11\n'
-        if self.modeltype == 'ISOTROPIC':
-            self.modelheader= '\tH(KM)\tVP(KM/S)\tVS(KM/S)\tRHO(GM/CC)\tQP\tQS\tETAP\tETAS\tFREFP\tFREFS'
-        elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-            self.modelheader= '\tH(KM)\tVPV(KM/S)\tVSV(KM/S)\tRHO(GM/CC)\tQP\tQS\tETAP\tETAS\tFREFP\tFREFS\n\tVPH(KM/S)\tVSH(KM/S)\tVPF(KM/S)'
-        self.HArr       = HArr
-        if self.modeltype == 'ISOTROPIC':
-            self.VsArr      = VsArr
-            self.VpArr      = VpArr
-        elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-            self.VsvArr     = VsArr
-            self.VpvArr     = VpArr
-            self.VshArr     = VsArr
-            self.VphArr     = VpArr
-            if VsArr.size == 0 or VpArr.size==0 or VsArr.size != VpArr.size:
-                self.VpfArr = np.array([])
-            else:
-                self.VpfArr = np.sqrt(VpArr**2 - 2*VsArr**2)
-        self.rhoArr     = rhoArr
-        self.QpArr      = QpArr
-        self.QsArr      = QsArr
-        self.etapArr    = etapArr
-        self.etasArr    = etasArr
-        self.frefpArr   = frefpArr
-        self.frefsArr   = frefsArr
+        fielddict       = self._velfielddict(VpArr, VsArr)
+        fielddict.update({'HArr': HArr, 'rhoArr': rhoArr, 'QpArr': QpArr, 'QsArr': QsArr,
+                'etapArr': etapArr, 'etasArr': etasArr, 'frefpArr': frefpArr, 'frefsArr': frefsArr})
+        self._data      = np.zeros((HArr.size, len(self._cols)), dtype=float)
+        for field in self._paramfields():
+            value   = np.asarray(fielddict[field], dtype=float)
+            if value.size == HArr.size:
+                self._data[:, self._cols[field]]    = value
+            elif value.size != 0:
+                raise ValueError('Inconsistent array size for '+field)
+        self._recompute_depths()
+        return
+
+    def copy(self):
+        """
+        Return an independent copy of the model.
+        Arrays are duplicated with ndarray.copy (a plain memcpy), everything
+        else is shared by reference; much cheaper than copy.deepcopy.
+        """
+        new             = object.__new__(type(self))
+        new.__dict__    = dict((k, v.copy() if isinstance(v, np.ndarray) else v)
+                            for k, v in self.__dict__.items())
+        return new
+
+    def _paramfields(self):
+        """
+        Get the list of layer-parameter attribute names for the current model type, in column order
+        """
+        return sorted(self._cols, key=self._cols.get)
+
+    @property
+    def _data(self):
+        """
+        Layer-parameter matrix: the filled rows of the backing buffer
+        """
+        return self._buf[:self._size]
+
+    @_data.setter
+    def _data(self, value):
+        # direct assignment (slices, vstack rebuilds) resets the buffer to an
+        # exactly-sized array; the next tail append reallocates with headroom
+        self._buf   = value
+        self._size  = value.shape[0]
+
+    def _append_rows(self, block):
+        """
+        Append rows to the layer-parameter matrix, doubling the backing buffer when full
+        so repeated tail appends cost amortized O(1) instead of one full copy each
+        """
+        n   = block.shape[0]
+        if self._size + n > self._buf.shape[0]:
+            newcap              = max(2*self._buf.shape[0], self._size+n)
+            buf2                = np.empty((newcap, len(self._cols)), dtype=float)
+            buf2[:self._size]   = self._buf[:self._size]
+            self._buf           = buf2
+        self._buf[self._size:self._size+n]  = block
+        self._size  += n
+        return
+
+    def _row_kwargs(self, i):
+        """
+        Get the addlayer keyword dict (everything but thickness) describing layer i
+        """
+        kwargs  = {'rho': self.rhoArr[i], 'Qp': self.QpArr[i], 'Qs': self.QsArr[i],
+                'etap': self.etapArr[i], 'etas': self.etasArr[i],
+                'frefp': self.frefpArr[i], 'frefs': self.frefsArr[i]}
+        kwargs.update(self._velkwargs(i))
+        return kwargs
+
+    def _set_modeltype(self, modeltype):
+        """
+        Switch between ISOTROPIC and TRANSVERSE ISOTROPIC, resetting the layer-parameter matrix
+        """
+        if modeltype == 'ISOTROPIC':
+            self.__class__  = IsotropicModel1d
+        elif modeltype == 'TRANSVERSE ISOTROPIC':
+            self.__class__  = TIModel1d
+        else:
+            raise ValueError('Unexpected model type: '+modeltype)
+        self._data      = np.zeros((0, len(self._cols)), dtype=float)
+        self._recompute_depths()
+        return
+
+    def _assemble(self, fielddict):
+        """
+        Rebuild the layer-parameter matrix from a field name -> array dict
+        """
+        N       = np.asarray(fielddict['HArr']).size
+        data    = np.empty((N, len(self._cols)), dtype=float)
+        for field in self._paramfields():
+            data[:, self._cols[field]]  = fielddict[field]
+        self._data  = data
+        self._recompute_depths()
+        return
+
+    def _recompute_depths(self):
+        """
+        Refresh the cached bottom-depth (DepthArr) and top-depth (topArr) arrays from HArr
+        """
         self.DepthArr   = np.cumsum(self.HArr)
+        self.topArr     = self.DepthArr - self.HArr
         return
-    
-    def copy(self): return copy.deepcopy(self)
-    
+
     def ak135(self, modelname='AK135 CONTINENTAL MODEL'):
         """
         Load ak135 model
         """
         self.modelname  = modelname
-        if os.path.isfile(datadir+'/ak135_dbase.txt'):
-            ak135Arr        = np.loadtxt(datadir+'/ak135_dbase.txt')
-        else:
-            ak135Arr        = np.loadtxt('ak135_dbase.txt')
-        self.HArr       = ak135Arr[:,0]
-        if self.modeltype == 'ISOTROPIC':
-            self.VpArr      = ak135Arr[:,1]
-            self.VsArr      = ak135Arr[:,2]
-        elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-            self.VsvArr     = ak135Arr[:,2]
-            self.VpvArr     = ak135Arr[:,1]
-            self.VshArr     = ak135Arr[:,2]
-            self.VphArr     = ak135Arr[:,1]
-            self.VpfArr     = np.sqrt ( (ak135Arr[:,1])**2 - 2.*((ak135Arr[:,2])**2) )
-        self.rhoArr     = ak135Arr[:,3]
-        self.QpArr      = ak135Arr[:,4]
-        self.QsArr      = ak135Arr[:,5]
-        self.etapArr    = ak135Arr[:,6]
-        self.etasArr    = ak135Arr[:,7]
-        self.frefpArr   = ak135Arr[:,8]
-        self.frefsArr   = ak135Arr[:,9]
-        self.DepthArr   = np.cumsum(self.HArr)
+        ak135Arr        = _load_ak135()
+        fielddict       = self._velfielddict(ak135Arr[:,1], ak135Arr[:,2])
+        fielddict.update({'HArr': ak135Arr[:,0], 'rhoArr': ak135Arr[:,3], 'QpArr': ak135Arr[:,4], 'QsArr': ak135Arr[:,5],
+                'etapArr': ak135Arr[:,6], 'etasArr': ak135Arr[:,7], 'frefpArr': ak135Arr[:,8], 'frefsArr': ak135Arr[:,9]})
+        self._assemble(fielddict)
         self.check_model(verbose=False, trim=True)
         return
     
@@ -109,24 +307,11 @@ class Model1d(object):
         get model
         """
         self.modelname  = modelname
-        self.HArr       = HArr
-        if self.modeltype == 'ISOTROPIC':
-            self.VsArr      = VsArr
-            self.VpArr      = VpArr
-        elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-            self.VsvArr     = VsArr
-            self.VpvArr     = VpArr
-            self.VshArr     = VsArr
-            self.VphArr     = VpArr
-            self.VpfArr     = np.sqrt(VpArr**2 - 2.*(VsArr**2))
-        self.rhoArr     = rhoArr
-        self.QpArr      = QpArr
-        self.QsArr      = QsArr
-        self.etapArr    = etap*np.ones(HArr.size)
-        self.etasArr    = etas*np.ones(HArr.size)
-        self.frefpArr   = frefp*np.ones(HArr.size)
-        self.frefsArr   = fres*np.ones(HArr.size)
-        self.DepthArr   = np.cumsum(self.HArr)
+        fielddict       = self._velfielddict(VpArr, VsArr)
+        fielddict.update({'HArr': HArr, 'rhoArr': rhoArr, 'QpArr': QpArr, 'QsArr': QsArr,
+                'etapArr': etap*np.ones(HArr.size), 'etasArr': etas*np.ones(HArr.size),
+                'frefpArr': frefp*np.ones(HArr.size), 'frefsArr': fres*np.ones(HArr.size)})
+        self._assemble(fielddict)
         return
     
     def trim(self, ind0=None, indf=None, zmax=None):
@@ -135,54 +320,21 @@ class Model1d(object):
         """
         add_last_layer  = False
         if zmax != None and indf == None:
-            index = (np.where(self.DepthArr> zmax)[0])
-            if index.size != 0:
-                indf = index[0]
+            # DepthArr is sorted: binary-search the first layer deeper than
+            # zmax instead of materializing a boolean scan over the model
+            pos = int(np.searchsorted(self.DepthArr, zmax, side='right'))
+            if pos < self.DepthArr.size:
+                indf = pos
                 if self.DepthArr[indf-1] < zmax:
-                    add_last_layer = True
-                    H       = zmax - self.DepthArr[indf-1]
-                    if self.modeltype == 'ISOTROPIC':
-                        vs  = self.VsArr[indf]
-                        vp  = self.VpArr[indf]
-                    elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                        vsv = self.VsvArr[indf]
-                        vpv = self.VpvArr[indf]
-                        vsh = self.VshArr[indf]
-                        vph = self.VphArr[indf]
-                        vpf = self.VpfArr[indf]
-                    rho     = self.rhoArr[indf]
-                    Qp      = self.QpArr[indf]
-                    Qs      = self.QsArr[indf]
-                    etap    = self.etapArr[indf]
-                    etas    = self.etasArr[indf]
-                    frefp   = self.frefpArr[indf]
-                    frefs   = self.frefsArr[indf]
-        self.HArr       = self.HArr[ind0:indf]
-        if self.modeltype == 'ISOTROPIC':
-            self.VpArr      = self.VpArr[ind0:indf]
-            self.VsArr      = self.VsArr[ind0:indf]
-        elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-            self.VsvArr     = self.VsvArr[ind0:indf]
-            self.VpvArr     = self.VpvArr[ind0:indf]
-            self.VshArr     = self.VshArr[ind0:indf]
-            self.VphArr     = self.VphArr[ind0:indf]
-            self.VpfArr     = self.VpfArr[ind0:indf]
-        self.rhoArr     = self.rhoArr[ind0:indf]
-        self.QpArr      = self.QpArr[ind0:indf]
-        self.QsArr      = self.QsArr[ind0:indf]
-        self.etapArr    = self.etapArr[ind0:indf]
-        self.etasArr    = self.etasArr[ind0:indf]
-        self.frefpArr   = self.frefpArr[ind0:indf]
-        self.frefsArr   = self.frefsArr[ind0:indf]
+                    add_last_layer  = True
+                    H               = zmax - self.DepthArr[indf-1]
+                    kwargs          = self._row_kwargs(indf)
+        self._data      = self._data[ind0:indf]
         self.DepthArr   = self.DepthArr[ind0:indf]
+        self.topArr     = self.topArr[ind0:indf]
         if add_last_layer:
-            if self.modeltype == 'ISOTROPIC':
-                self.addlayer(H=H, vsv=vs, vsh=vs, vpv=vp, vph=vp, rho=rho,
-                                    Qp=Qp, Qs=Qs, etap=etap, etas=etas, frefp=frefp, frefs=frefs)
-            if self.modeltype == 'TRANSVERSE ISOTROPIC':
-                self.addlayer(H=H, vsv=vsv, vsh=vsh, vpv=vpv, vph=vph, vpf=vpf, rho=rho,
-                                    Qp=Qp, Qs=Qs, etap=etap, etas=etas, frefp=frefp, frefs=frefs)
-        if self.HArr.size == 0: print 'WARNING: trimed model has a length of zero!'
+            self.addlayer(H=H, **kwargs)
+        if self.HArr.size == 0: print('WARNING: trimed model has a length of zero!')
         return
     
     def relayerize(self, h, npinterp=False):
@@ -191,104 +343,46 @@ class Model1d(object):
         """
         tmodel      = self.copy()
         zmax        = self.DepthArr[-1]
-        if (zmax/h)%1 > 1e-5: print 'WARNING: zmax is not integer multiple of layer thickness!'
-        tmodel.HArr        = np.ones(int(np.floor(zmax/h)), dtype=float)*h
+        if (zmax/h)%1 > 1e-5: print('WARNING: zmax is not integer multiple of layer thickness!')
+        HArr        = np.ones(int(np.floor(zmax/h)), dtype=float)*h
+        zbArr       = np.cumsum(HArr)
+        fielddict   = {'HArr': HArr}
         if npinterp:
-            tmodel.DepthArr = np.cumsum(tmodel.HArr)
-            midzArr         = tmodel.DepthArr - h/2.
-            z0Arr           = self.DepthArr-self.HArr/2.
-            if tmodel.modeltype == 'ISOTROPIC':
-                tmodel.VsArr    = np.interp(midzArr, xp = z0Arr, fp = self.VsArr)
-                tmodel.VpArr    = np.interp(midzArr, xp = z0Arr, fp = self.VpArr)
-            elif tmodel.modeltype == 'TRANSVERSE ISOTROPIC':
-                tmodel.VsvArr   = np.interp(midzArr, xp = z0Arr, fp = self.VsvArr)
-                tmodel.VpvArr   = np.interp(midzArr, xp = z0Arr, fp = self.VpvArr)
-                tmodel.VshArr   = np.interp(midzArr, xp = z0Arr, fp = self.VshArr)
-                tmodel.VphArr   = np.interp(midzArr, xp = z0Arr, fp = self.VphArr)
-                tmodel.VpfArr   = np.interp(midzArr, xp = z0Arr, fp = self.VpfArr)
-            tmodel.rhoArr       = np.interp(midzArr, xp = z0Arr, fp = self.rhoArr)
-            tmodel.QpArr        = np.interp(midzArr, xp = z0Arr, fp = self.QpArr)
-            tmodel.QsArr        = np.interp(midzArr, xp = z0Arr, fp = self.QsArr)
-            tmodel.etapArr      = np.interp(midzArr, xp = z0Arr, fp = self.etapArr)
-            tmodel.etasArr      = np.interp(midzArr, xp = z0Arr, fp = self.etasArr)
-            tmodel.frefpArr     = np.interp(midzArr, xp = z0Arr, fp = self.frefpArr)
-            tmodel.frefsArr     = np.interp(midzArr, xp = z0Arr, fp = self.frefsArr)
+            midzArr     = zbArr - h/2.
+            z0Arr       = self.DepthArr-self.HArr/2.
+            for field in self._paramfields():
+                if field == 'HArr': continue
+                fielddict[field]    = np.interp(midzArr, xp = z0Arr, fp = getattr(self, field))
         else:
-            if tmodel.modeltype == 'ISOTROPIC':
-                VsArr   = np.array([])
-                VpArr   = np.array([])
-            elif tmodel.modeltype == 'TRANSVERSE ISOTROPIC':
-                VsvArr  = np.array([])
-                VpvArr  = np.array([])
-                VshArr  = np.array([])
-                VphArr  = np.array([])
-                VpfArr  = np.array([])
-            rhoArr      = np.array([])
-            QpArr       = np.array([])
-            QsArr       = np.array([])
-            etapArr     = np.array([])
-            etasArr     = np.array([])
-            frefpArr    = np.array([])
-            frefsArr    = np.array([])
-            zbArr       = np.cumsum(tmodel.HArr)
-            for zb in zbArr:
-                zt      = zb -h
-                indt    = (np.where(zt <= self.DepthArr)[0])[0] 
-                # if indt < 0: indt = 0
-                indb    = (np.where(zb <= self.DepthArr)[0])[0] 
-                # if indb < 0: indb = 0
-                if tmodel.modeltype == 'ISOTROPIC':
-                    VsArr   = np.append(VsArr, (self.VsArr[indt]+self.VsArr[indb])/2.)
-                    VpArr   = np.append(VpArr, (self.VpArr[indt]+self.VpArr[indb])/2.)
-                elif tmodel.modeltype == 'TRANSVERSE ISOTROPIC':
-                    VsvArr  = np.append(VsvArr, (self.VsvArr[indt]+self.VsvArr[indb])/2.)
-                    VpvArr  = np.append(VpvArr, (self.VpvArr[indt]+self.VpvArr[indb])/2.)
-                    VshArr  = np.append(VshArr, (self.VshArr[indt]+self.VshArr[indb])/2.)
-                    VphArr  = np.append(VphArr, (self.VphArr[indt]+self.VphArr[indb])/2.)
-                    VpfArr  = np.append(VpfArr, (self.VpfArr[indt]+self.VpfArr[indb])/2.)
-                rhoArr      = np.append(rhoArr, (self.rhoArr[indt]+self.rhoArr[indb])/2.)
-                QpArr       = np.append(QpArr, (self.QpArr[indt]+self.QpArr[indb])/2.)
-                QsArr       = np.append(QsArr, (self.QsArr[indt]+self.QsArr[indb])/2.)
-                etapArr     = np.append(etapArr, (self.etapArr[indt]+self.etapArr[indb])/2.)
-                etasArr     = np.append(etasArr, (self.etasArr[indt]+self.etasArr[indb])/2.)
-                frefpArr    = np.append(frefpArr, (self.frefpArr[indt]+self.frefpArr[indb])/2.)
-                frefsArr    = np.append(frefsArr, (self.frefsArr[indt]+self.frefsArr[indb])/2.)
-            if tmodel.modeltype == 'ISOTROPIC':
-                tmodel.VsArr    = VsArr
-                tmodel.VpArr    = VpArr
-            elif tmodel.modeltype == 'TRANSVERSE ISOTROPIC':
-                tmodel.VsvArr   = VsvArr
-                tmodel.VpvArr   = VpvArr
-                tmodel.VshArr   = VshArr
-                tmodel.VphArr   = VphArr
-                tmodel.VpfArr   = VpfArr
-            tmodel.rhoArr       = rhoArr
-            tmodel.QpArr        = QpArr
-            tmodel.QsArr        = QsArr
-            tmodel.etapArr      = etapArr
-            tmodel.etasArr      = etasArr
-            tmodel.frefpArr     = frefpArr
-            tmodel.frefsArr     = frefsArr
-            tmodel.DepthArr     = zbArr
+            # locate the layers containing the top/bottom of each new layer once,
+            # instead of scanning DepthArr twice per layer
+            indtArr     = np.searchsorted(self.DepthArr, zbArr - h, side='left')
+            indbArr     = np.searchsorted(self.DepthArr, zbArr, side='left')
+            for field in self._paramfields():
+                if field == 'HArr': continue
+                arr                 = getattr(self, field)
+                fielddict[field]    = (arr[indtArr]+arr[indbArr])/2.
+        tmodel._assemble(fielddict)
         return tmodel
     
     def check_iso_model(self):
         if self.modeltype != 'ISOTROPIC': raise ValueError('check_iso_model function only works for isotropic model!')
-        if (self.HArr[self.HArr<1.0]).size %2 !=0: raise ValueError('Invalid vertical profile! Check layer thicknesses!')
-        tempH   = self.HArr[self.HArr<1.0]
-        tempVs  = self.VsArr[self.HArr<1.0]
-        tempVp  = self.VpArr[self.HArr<1.0]
-        temprho = self.rhoArr[self.HArr<1.0]
-        tempQs  = self.QsArr[self.HArr<1.0]
-        tempQp  = self.QpArr[self.HArr<1.0]
-        ind0    = np.arange(tempH.size/2, dtype=int)*2
-        ind1    = ind0 + 1
-        HArr    = np.append( (tempH[ind0] + tempH[ind1]), self.HArr[self.HArr>=1.0] )
-        VsArr   = np.append( (tempVs[ind0] + tempVs[ind1])/2., self.VsArr[self.HArr>=1.0] )
-        VpArr   = np.append( (tempVp[ind0] + tempVp[ind1])/2., self.VpArr[self.HArr>=1.0] )
-        rhoArr  = np.append( (temprho[ind0] + temprho[ind1])/2., self.rhoArr[self.HArr>=1.0] )
-        QsArr   = np.append( (tempQs[ind0] + tempQs[ind1])/2., self.QsArr[self.HArr>=1.0] )
-        QpArr   = np.append( (tempQp[ind0] + tempQp[ind1])/2., self.QpArr[self.HArr>=1.0] )
+        thin    = self.HArr < 1.0
+        thick   = np.logical_not(thin)
+        if (self.HArr[thin]).size %2 !=0: raise ValueError('Invalid vertical profile! Check layer thicknesses!')
+        # merge each pair of thin layers in one reduction over the parameter
+        # matrix: thicknesses add, everything else averages
+        thinblk = (self._data[thin]).reshape(-1, 2, len(self._cols))
+        merged  = thinblk.mean(axis=1)
+        merged[:, 0]    = thinblk[:, :, 0].sum(axis=1)
+        data    = np.concatenate( (merged, self._data[thick]) )
+        cols    = self._cols
+        HArr    = data[:, cols['HArr']]
+        VsArr   = data[:, cols['VsArr']]
+        VpArr   = data[:, cols['VpArr']]
+        rhoArr  = data[:, cols['rhoArr']]
+        QsArr   = data[:, cols['QsArr']]
+        QpArr   = data[:, cols['QpArr']]
         if HArr.size <= 200:
             self.getmodel(modelname=self.modelname, HArr=HArr, VpArr=VpArr, VsArr=VsArr,
                         rhoArr=rhoArr, QpArr=QpArr, QsArr=QsArr)
@@ -311,9 +405,9 @@ class Model1d(object):
             if indexsv.size == 0: return True
             elif indexsv.size == 1 and indexsv[0] == 0: return True
             else:
-                if verbose: print 'WARNING: For TI model, only the top Vsv/Vsh can be zero!'
+                if verbose: print('WARNING: For TI model, only the top Vsv/Vsh can be zero!')
                 if trim:
-                    if verbose: print 'Model will be trimed to discard zero non-top Vsv/Vsh!'
+                    if verbose: print('Model will be trimed to discard zero non-top Vsv/Vsh!')
                     if indexsv[0] == 0:
                         self.trim(indf=indexsv[1])
                     else:
@@ -345,246 +439,87 @@ class Model1d(object):
         #####
         # Default: Brocher crust
         #####
-        if vpv  is None: vpv    = 0.9409+2.0947*vsv-0.8206*vsv**2+0.2683*vsv**3-0.0251*vsv**4
+        if vpv  is None: vpv    = _brocher_vp(vsv)
         if vph  is None: vph    = vpv
         if vsh  is None: vsh    = vsv
-        if rho  is None: rho    = 1.6612*vpv-0.4721*vpv**2+0.0671*vpv**3-0.0043*vpv**4+0.000106*vpv**5
-        if vpf  is None: vpf    = np.sqrt(vpv**2 - 2.*vsv**2)
-        if self.HArr.size==0:
-            self.HArr       = np.append(self.HArr, H)
-            if self.modeltype == 'ISOTROPIC':
-                self.VpArr  = np.append(self.VpArr, vpv)
-                self.VsArr  = np.append(self.VsArr, vsv)
-            elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                self.VpvArr = np.append(self.VpvArr, vpv)
-                self.VsvArr = np.append(self.VsvArr, vsv)
-                self.VphArr = np.append(self.VphArr, vph)
-                self.VshArr = np.append(self.VshArr, vsh)
-                self.VpfArr = np.append(self.VpfArr, vpf)
-            self.rhoArr     = np.append(self.rhoArr, rho)
-            self.QpArr      = np.append(self.QpArr, Qp)
-            self.QsArr      = np.append(self.QsArr, Qs)
-            self.etapArr    = np.append(self.etapArr, etap)
-            self.etasArr    = np.append(self.etasArr, etas)
-            self.frefpArr   = np.append(self.frefpArr, frefp)
-            self.frefsArr   = np.append(self.frefsArr, frefs)
-            self.DepthArr   = np.cumsum(self.HArr)
+        if rho  is None: rho    = _brocher_rho(vpv)
+        if vpf  is None: vpf    = _vpf(vpv, vsv)
+        newlayer    = self._vellayer(vpv, vsv, vph, vsh, vpf)
+        newlayer.update({'HArr': H, 'rhoArr': rho, 'QpArr': Qp, 'QsArr': Qs, 'etapArr': etap,
+                'etasArr': etas, 'frefpArr': frefp, 'frefsArr': frefs})
+        newrow      = np.empty(len(self._cols))
+        for field in self._paramfields():
+            newrow[self._cols[field]]   = newlayer[field]
+        if self._data.shape[0]==0 or zmin >= self.DepthArr[-1]:
+            # simply append one layer to the bottom; depths get an O(1) tail
+            # update instead of a full cumsum
+            zlast           = self.DepthArr[-1] if self.DepthArr.size else 0.
+            self._append_rows(newrow.reshape(1, -1))
+            self.topArr     = np.append(self.topArr, zlast)
+            self.DepthArr   = np.append(self.DepthArr, zlast+H)
             return
-        if zmin >= self.DepthArr[-1]:
-            self.HArr       = np.append(self.HArr, H)
-            if self.modeltype == 'ISOTROPIC':
-                self.VpArr  = np.append(self.VpArr, vpv)
-                self.VsArr  = np.append(self.VsArr, vsv)
-            elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                self.VpvArr = np.append(self.VpvArr, vpv)
-                self.VsvArr = np.append(self.VsvArr, vsv)
-                self.VphArr = np.append(self.VphArr, vph)
-                self.VshArr = np.append(self.VshArr, vsh)
-                self.VpfArr = np.append(self.VpfArr, vpf)
-            self.rhoArr     = np.append(self.rhoArr, rho)
-            self.QpArr      = np.append(self.QpArr, Qp)
-            self.QsArr      = np.append(self.QsArr, Qs)
-            self.etapArr    = np.append(self.etapArr, etap)
-            self.etasArr    = np.append(self.etasArr, etas)
-            self.frefpArr   = np.append(self.frefpArr, frefp)
-            self.frefsArr   = np.append(self.frefsArr, frefs)
-            self.DepthArr   = np.cumsum(self.HArr)
-        elif zmin <= 0.:
-            # discard layers with depth < H
-            self.HArr       = self.HArr[self.DepthArr >H]
-            if self.modeltype == 'ISOTROPIC':
-                self.VpArr      = self.VpArr[self.DepthArr >H]
-                self.VsArr      = self.VsArr[self.DepthArr >H]
-            elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                self.VpvArr     = self.VpvArr[self.DepthArr >H]
-                self.VsvArr     = self.VsvArr[self.DepthArr >H]
-                self.VphArr     = self.VphArr[self.DepthArr >H]
-                self.VshArr     = self.VshArr[self.DepthArr >H]
-                self.VpfArr     = self.VpfArr[self.DepthArr >H]
-            self.rhoArr     = self.rhoArr[self.DepthArr >H]
-            self.QpArr      = self.QpArr[self.DepthArr >H]
-            self.QsArr      = self.QsArr[self.DepthArr >H]
-            self.etapArr    = self.etapArr[self.DepthArr >H]
-            self.etasArr    = self.etasArr[self.DepthArr >H]
-            self.frefpArr   = self.frefpArr[self.DepthArr >H]
-            self.frefsArr   = self.frefsArr[self.DepthArr >H]
-            # change the thickness of the current first layer
-            self.HArr[0]    = (self.DepthArr[self.DepthArr >H])[0]-H
-            # add H to the first layer
-            self.HArr       = np.append(H, self.HArr)
-            if self.modeltype == 'ISOTROPIC':
-                self.VpArr      = np.append(vpv, self.VpArr)
-                self.VsArr      = np.append(vsv, self.VsArr)
-            elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                self.VpvArr     = np.append(vpv, self.VpvArr)
-                self.VsvArr     = np.append(vsv, self.VsvArr)
-                self.VphArr     = np.append(vph, self.VphArr)
-                self.VshArr     = np.append(vsh, self.VshArr)
-                self.VpfArr     = np.append(vpf, self.VpfArr)
-            self.rhoArr     = np.append(rho, self.rhoArr)
-            self.QpArr      = np.append(Qp, self.QpArr)
-            self.QsArr      = np.append(Qs, self.QsArr)
-            self.etapArr    = np.append(etap, self.etapArr)
-            self.etasArr    = np.append(etas, self.etasArr)
-            self.frefpArr   = np.append(frefp, self.frefpArr)
-            self.frefsArr   = np.append(frefs, self.frefsArr)
-            self.DepthArr   = np.cumsum(self.HArr)
-        else:
-            zmax        = zmin+H
-            topArr      = self.DepthArr-self.HArr
-            # Top layers above zmin
-            HArrT       = self.HArr[self.DepthArr <=zmin]
-            if self.modeltype == 'ISOTROPIC':
-                VpArrT      = self.VpArr[self.DepthArr <=zmin]
-                VsArrT      = self.VsArr[self.DepthArr <=zmin]
-            elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                VpvArrT     = self.VpvArr[self.DepthArr <=zmin]
-                VsvArrT     = self.VsvArr[self.DepthArr <=zmin]
-                VphArrT     = self.VphArr[self.DepthArr <=zmin]
-                VshArrT     = self.VshArr[self.DepthArr <=zmin]
-                VpfArrT     = self.VpfArr[self.DepthArr <=zmin]
-            rhoArrT     = self.rhoArr[self.DepthArr <=zmin]
-            QpArrT      = self.QpArr[self.DepthArr <=zmin]
-            QsArrT      = self.QsArr[self.DepthArr <=zmin]
-            etapArrT    = self.etapArr[self.DepthArr <=zmin]
-            etasArrT    = self.etasArr[self.DepthArr <=zmin]
-            frefpArrT   = self.frefpArr[self.DepthArr <=zmin]
-            frefsArrT   = self.frefsArr[self.DepthArr <=zmin]
-            tH          = zmin - (topArr[self.DepthArr >zmin]) [0]
-            if tH != 0:
-                if self.modeltype == 'ISOTROPIC':
-                    tVp         = (self.VpArr[self.DepthArr >zmin])[0]
-                    tVs         = (self.VsArr[self.DepthArr >zmin])[0]
-                elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                    tVpv        = (self.VpvArr[self.DepthArr >zmin])[0]
-                    tVsv        = (self.VsvArr[self.DepthArr >zmin])[0]
-                    tVph        = (self.VphArr[self.DepthArr >zmin])[0]
-                    tVsh        = (self.VshArr[self.DepthArr >zmin])[0]
-                    tVpf        = (self.VpfArr[self.DepthArr >zmin])[0]
-                trho        = (self.rhoArr[self.DepthArr >zmin])[0]
-                tQp         = (self.QpArr[self.DepthArr >zmin])[0]
-                tQs         = (self.QsArr[self.DepthArr >zmin])[0]
-                tetap       = (self.etapArr[self.DepthArr >zmin])[0]
-                tetas       = (self.etasArr[self.DepthArr >zmin])[0]
-                tfrefp      = (self.frefpArr[self.DepthArr >zmin])[0]
-                tfrefs      = (self.frefsArr[self.DepthArr >zmin])[0]
-                HArrT       = np.append(HArrT, tH)
-                if self.modeltype == 'ISOTROPIC':
-                    VpArrT      = np.append(VpArrT, tVp)
-                    VsArrT      = np.append(VsArrT, tVs)
-                elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                    VpvArrT     = np.append(VpvArrT, tVpv)
-                    VsvArrT     = np.append(VsvArrT, tVsv)
-                    VphArrT     = np.append(VphArrT, tVph)
-                    VshArrT     = np.append(VshArrT, tVsh)
-                    VpfArrT     = np.append(VpfArrT, tVpf)
-                rhoArrT     = np.append(rhoArrT, trho)
-                QpArrT      = np.append(QpArrT, tQp)
-                QsArrT      = np.append(QsArrT, tQs)
-                etapArrT    = np.append(etapArrT, tetap)
-                etasArrT    = np.append(etasArrT, tetas)
-                frefpArrT   = np.append(frefpArrT, tfrefp)
-                frefsArrT   = np.append(frefsArrT, tfrefs)
-            # Bottom layer bolow zmax
-            HArrB       = self.HArr[topArr >=zmax]
-            if self.modeltype == 'ISOTROPIC':
-                VpArrB      = self.VpArr[topArr >=zmax]
-                VsArrB      = self.VsArr[topArr >=zmax]
-            elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                VpvArrB     = self.VpvArr[topArr >=zmax]
-                VsvArrB     = self.VsvArr[topArr >=zmax]
-                VphArrB     = self.VphArr[topArr >=zmax]
-                VshArrB     = self.VshArr[topArr >=zmax]
-                VpfArrB     = self.VpfArr[topArr >=zmax]
-            rhoArrB     = self.rhoArr[topArr >=zmax]
-            QpArrB      = self.QpArr[topArr >=zmax]
-            QsArrB      = self.QsArr[topArr >=zmax]
-            etapArrB    = self.etapArr[topArr >=zmax]
-            etasArrB    = self.etasArr[topArr >=zmax]
-            frefpArrB   = self.frefpArr[topArr >=zmax]
-            frefsArrB   = self.frefsArr[topArr >=zmax]
-            bH          = (self.DepthArr[topArr <zmax]) [-1]- zmax
-            if bH != 0:
-                if self.modeltype == 'ISOTROPIC':
-                    bVp         = (self.VpArr[topArr <zmax]) [-1]
-                    bVs         = (self.VsArr[topArr <zmax]) [-1]
-                elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                    bVpv        = (self.VpvArr[topArr <zmax]) [-1]
-                    bVsv        = (self.VsvArr[topArr <zmax]) [-1]
-                    bVph        = (self.VphArr[topArr <zmax]) [-1]
-                    bVsh        = (self.VshArr[topArr <zmax]) [-1]
-                    bVpf        = (self.VpfArr[topArr <zmax]) [-1]
-                brho        = (self.rhoArr[topArr <zmax]) [-1]
-                bQp         = (self.QpArr[topArr <zmax]) [-1]
-                bQs         = (self.QsArr[topArr <zmax]) [-1]
-                betap       = (self.etapArr[topArr <zmax]) [-1]
-                betas       = (self.etasArr[topArr <zmax]) [-1]
-                bfrefp      = (self.frefpArr[topArr <zmax]) [-1]
-                bfrefs      = (self.frefsArr[topArr <zmax]) [-1]
-                HArrB       = np.append(bH, HArrB)
-                if self.modeltype == 'ISOTROPIC':
-                    VpArrB      = np.append(bVp, VpArrB)
-                    VsArrB      = np.append(bVs, VsArrB)
-                elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                    VpvArrB     = np.append(bVpv, VpvArrB)
-                    VsvArrB     = np.append(bVsv, VsvArrB)
-                    VphArrB     = np.append(bVph, VphArrB)
-                    VshArrB     = np.append(bVsh, VshArrB)
-                    VpfArrB     = np.append(bVpf, VpfArrB)
-                rhoArrB     = np.append(brho, rhoArrB)
-                QpArrB      = np.append(bQp, QpArrB)
-                QsArrB      = np.append(bQs, QsArrB)
-                etapArrB    = np.append(betap, etapArrB)
-                etasArrB    = np.append(betas, etasArrB)
-                frefpArrB   = np.append(bfrefp, frefpArrB)
-                frefsArrB   = np.append(bfrefs, frefsArrB)
-            #####################################
-            self.HArr       = np.append(HArrT, H)
-            if self.modeltype == 'ISOTROPIC':
-                self.VpArr      = np.append(VpArrT, vpv)
-                self.VsArr      = np.append(VsArrT, vsv)
-            elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                self.VpvArr     = np.append(VpvArrT, vpv)
-                self.VsvArr     = np.append(VsvArrT, vsv)
-                self.VphArr     = np.append(VphArrT, vph)
-                self.VshArr     = np.append(VshArrT, vsh)
-                self.VpfArr     = np.append(VpfArrT, vpf)
-            self.rhoArr     = np.append(rhoArrT, rho)
-            self.QpArr      = np.append(QpArrT, Qp)
-            self.QsArr      = np.append(QsArrT, Qs)
-            self.etapArr    = np.append(etapArrT, etap)
-            self.etasArr    = np.append(etasArrT, etas)
-            self.frefpArr   = np.append(frefpArrT, frefp)
-            self.frefsArr   = np.append(frefsArrT,frefs)
-            #####################################
-            self.HArr       = np.append(self.HArr, HArrB)
-            if self.modeltype == 'ISOTROPIC':
-                self.VpArr      = np.append(self.VpArr, VpArrB)
-                self.VsArr      = np.append(self.VsArr, VsArrB)
-            elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                self.VpvArr     = np.append(self.VpvArr, VpvArrB)
-                self.VsvArr     = np.append(self.VsvArr, VsvArrB)
-                self.VphArr     = np.append(self.VphArr, VphArrB)
-                self.VshArr     = np.append(self.VshArr, VshArrB)
-                self.VpfArr     = np.append(self.VpfArr, VpfArrB)
-            self.rhoArr     = np.append(self.rhoArr, rhoArrB)
-            self.QpArr      = np.append(self.QpArr, QpArrB)
-            self.QsArr      = np.append(self.QsArr, QsArrB)
-            self.etapArr    = np.append(self.etapArr, etapArrB)
-            self.etasArr    = np.append(self.etasArr, etasArrB)
-            self.frefpArr   = np.append(self.frefpArr, frefpArrB)
-            self.frefsArr   = np.append(self.frefsArr, frefsArrB)
-            self.DepthArr   = np.cumsum(self.HArr)
+        # general insert: the new layer replaces [zmin, zmin+H) -- clamped to
+        # the surface, so zmin <= 0 means replacing the top H km.  Layers fully
+        # above zmin end at row kT, layers fully below zmax start at kB; slices
+        # give views here where boolean masks would allocate and copy.
+        zmin        = max(zmin, 0.)
+        zmax        = zmin+H
+        kT          = np.searchsorted(self.DepthArr, zmin, side='right')
+        kB          = np.searchsorted(self.topArr, zmax, side='left')
+        # partial layer between the last top layer and zmin
+        tH          = zmin - self.topArr[kT]
+        # partial layer between zmax and the first bottom layer
+        bH          = self.DepthArr[kB-1] - zmax
+        parts       = [ self._data[:kT] ]
+        if tH != 0:
+            trow        = (self._data[kT]).copy()
+            trow[0]     = tH
+            parts.append( trow.reshape(1, -1) )
+        parts.append( newrow.reshape(1, -1) )
+        if bH != 0:
+            brow        = (self._data[kB-1]).copy()
+            brow[0]     = bH
+            parts.append( brow.reshape(1, -1) )
+        parts.append( self._data[kB:] )
+        self._data  = np.vstack(parts)
+        self._recompute_depths()
+        return
+
+    def addlayers(self, HArr, vsvArr, vshArr=None, vpvArr=None, vphArr=None, vpfArr=None, rhoArr=None,
+                Qp=310., Qs=150., etap=0.0, etas=0.0, frefp=1.0, frefs=1.0):
+        """ Append a batch of layers to the bottom of the model
+        Same defaults as addlayer (Brocher crust), but appends all layers with a
+        single concatenation of the layer-parameter matrix instead of one addlayer
+        call per layer.
+        """
+        HArr        = np.asarray(HArr, dtype=float)
+        vsvArr      = np.asarray(vsvArr, dtype=float)
+        N           = HArr.size
+        if vpvArr is None: vpvArr   = _brocher_vp(vsvArr)
+        if vphArr is None: vphArr   = vpvArr
+        if vshArr is None: vshArr   = vsvArr
+        if rhoArr is None: rhoArr   = _brocher_rho(vpvArr)
+        if vpfArr is None: vpfArr   = _vpf(vpvArr, vsvArr)
+        newlayers   = self._vellayer(vpvArr, vsvArr, vphArr, vshArr, vpfArr)
+        newlayers.update({'HArr': HArr, 'rhoArr': rhoArr, 'QpArr': Qp*np.ones(N), 'QsArr': Qs*np.ones(N),
+                'etapArr': etap*np.ones(N), 'etasArr': etas*np.ones(N),
+                'frefpArr': frefp*np.ones(N), 'frefsArr': frefs*np.ones(N)})
+        newblock    = np.empty((N, len(self._cols)))
+        for field in self._paramfields():
+            newblock[:, self._cols[field]]  = newlayers[field]
+        zlast           = self.DepthArr[-1] if self.DepthArr.size else 0.
+        self._append_rows(newblock)
+        newdepth        = zlast + np.cumsum(HArr)
+        self.topArr     = np.concatenate((self.topArr, newdepth-HArr))
+        self.DepthArr   = np.concatenate((self.DepthArr, newdepth))
         return
 
+
     def write(self, outfname):
         """
         Write profile to the Computer Programs in Seismology model format
         """
-        if self.modeltype == 'ISOTROPIC':
-            outstr  = '%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\n'
-        elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-            outstr  = '%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\n\t\t%f\t%f\t%f\n'
+        outstr, outArr  = self._writearr()
         with open(outfname, 'w') as f:
             f.write(self.modelver+'\n')
             f.write(self.modelname+'\n')
@@ -595,14 +530,7 @@ class Model1d(object):
             f.write(self.Vtype+'\n')
             f.write(self.line08_11)
             f.write(self.modelheader+'\n')
-            for i in xrange(self.HArr.size):
-                if self.modeltype == 'ISOTROPIC':
-                    tempstr=outstr %(self.HArr[i], self.VpArr[i], self.VsArr[i], self.rhoArr[i],
-                            self.QpArr[i], self.QsArr[i], self.etapArr[i], self.etasArr[i], self.frefpArr[i], self.frefsArr[i])
-                elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                    tempstr=outstr %(self.HArr[i], self.VpvArr[i], self.VsvArr[i], self.rhoArr[i], self.QpArr[i], self.QsArr[i],
-                        self.etapArr[i], self.etasArr[i], self.frefpArr[i], self.frefsArr[i], self.VphArr[i], self.VshArr[i], self.VpfArr[i])
-                f.write(tempstr)
+            np.savetxt(f, outArr, fmt=outstr)
         return
             
     def read(self, infname, verbose=True):
@@ -624,54 +552,26 @@ class Model1d(object):
             if modeltype == 'ISOTROPIC':
                 self.modelheader    = (f.readline()).split('\n')[0]
                 if self.modeltype == 'TRANSVERSE ISOTROPIC':
-                    if verbose: print 'WARNING: reading isotropic mod file, modeltype is changed!'
-                    self.VsArr          = np.array([])
-                    self.VpArr          = np.array([])
-                    del self.VsvArr, self.VpvArr, self.VshArr, self.VphArr, self.VpfArr
-                    self.modeltype      = modeltype
+                    if verbose: print('WARNING: reading isotropic mod file, modeltype is changed!')
+                    self._set_modeltype(modeltype)
             elif modeltype == 'TRANSVERSE ISOTROPIC':
                 self.modelheader    = (f.readline()).split('\n')[0] + '\n'
                 self.modelheader    += (f.readline()).split('\n')[0]
                 if self.modeltype == 'ISOTROPIC':
-                    if verbose: print 'WARNING: reading TI mod file, modeltype is changed!'
-                    del self.VsArr, self.VpArr
-                    self.modeltype      = modeltype
-                    self.VsvArr         = np.array([])
-                    self.VpvArr         = np.array([])
-                    self.VshArr         = np.array([])
-                    self.VphArr         = np.array([])
-                    self.VpfArr         = np.array([])
-            i=0
-            for line in f.readlines():
-                i               += 1
-                cline           = line.split()
-                if self.modeltype == 'ISOTROPIC':
-                    self.HArr       = np.append(self.HArr, float(cline[0]))
-                    self.VpArr      = np.append(self.VpArr, float(cline[1]))
-                    self.VsArr      = np.append(self.VsArr, float(cline[2]))
-                    self.rhoArr     = np.append(self.rhoArr, float(cline[3]))
-                    self.QpArr      = np.append(self.QpArr, float(cline[4]))
-                    self.QsArr      = np.append(self.QsArr, float(cline[5]))
-                    self.etapArr    = np.append(self.etapArr, float(cline[6]))
-                    self.etasArr    = np.append(self.etasArr, float(cline[7]))
-                    self.frefpArr   = np.append(self.frefpArr, float(cline[8]))
-                    self.frefsArr   = np.append(self.frefsArr, float(cline[9]))
-                elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-                    if i%2 != 0:
-                        self.HArr       = np.append(self.HArr, float(cline[0]))
-                        self.VpvArr     = np.append(self.VpvArr, float(cline[1]))
-                        self.VsvArr     = np.append(self.VsvArr, float(cline[2]))
-                        self.rhoArr     = np.append(self.rhoArr, float(cline[3]))
-                        self.QpArr      = np.append(self.QpArr, float(cline[4]))
-                        self.QsArr      = np.append(self.QsArr, float(cline[5]))
-                        self.etapArr    = np.append(self.etapArr, float(cline[6]))
-                        self.etasArr    = np.append(self.etasArr, float(cline[7]))
-                        self.frefpArr   = np.append(self.frefpArr, float(cline[8]))
-                        self.frefsArr   = np.append(self.frefsArr, float(cline[9]))
-                    else:
-                        self.VphArr     = np.append(self.VphArr, float(cline[0]))
-                        self.VshArr     = np.append(self.VshArr, float(cline[1]))
-                        self.VpfArr     = np.append(self.VpfArr, float(cline[2]))
+                    if verbose: print('WARNING: reading TI mod file, modeltype is changed!')
+                    self._set_modeltype(modeltype)
+            # parse the remaining lines in one pass, then slice columns with one allocation apiece
+            fielddict   = self._parse_body(f.readlines())
+            # the row count is known, so the parameter matrix grows with a
+            # single allocation filled in place, not one np.append per field
+            nold    = self._data.shape[0]
+            nnew    = fielddict['HArr'].size
+            data    = np.empty((nold+nnew, len(self._cols)), dtype=float)
+            data[:nold] = self._data
+            for field in self._paramfields():
+                data[nold:, self._cols[field]]  = fielddict[field]
+            self._data  = data
+            self._recompute_depths()
         return
     
     def read_layer_txt(self, infname):
@@ -689,22 +589,29 @@ class Model1d(object):
             except: pass
             try: rhoind = np.where(c=='rho')[0][0]
             except: pass
-        inArr = np.loadtxt(infname)
+        inArr = np.loadtxt(infname, ndmin=2)
         z0Arr = inArr[:, z0ind]
         HArr  = inArr[:, Hind]
-        vsArr = inArr[:, vsind]
-        # if vsind != None: vsArr = inArr[:, vsind]
-        if vpind != None: vpArr = inArr[:, vpind]
-        if rhoind != None: rhoArr = inArr[:, rhoind]
-        for i in xrange(z0Arr.size):
-            z0 = z0Arr[i]; H = HArr[i]; vs=vsArr[i]
-            if vpind==None and rhoind ==None: self.addlayer( H=H, vs=vs, vp=None, rho=None, zmin=z0)
-            elif vpind==None and rhoind !=None:
-                rho=rhoArr[i]; self.addlayer( H=H, vs=vs, vp=None, rho=rho, zmin=z0)
-            elif vpind!=None and rhoind ==None:
-                vp=vpArr[i]; self.addlayer( H=H, vs=vs, vp=vp, rho=None, zmin=z0)
-            elif vpind!=None and rhoind !=None:
-                vp=vpArr[i]; rho=rhoArr[i]; self.addlayer( H=H, vs=vs, vp=vp, rho=rho, zmin=z0)
+        vsArr = inArr[:, vsind].copy()
+        if vpind != None: vpArr = inArr[:, vpind].copy()
+        else: vpArr = np.nan*np.ones(z0Arr.size)
+        if rhoind != None: rhoArr = inArr[:, rhoind].copy()
+        else: rhoArr = np.nan*np.ones(z0Arr.size)
+        # fill the Brocher-crust defaults for all rows in one compiled pass,
+        # so the ingestion below does no per-row polynomial work
+        _brocher_fill(vsArr, vpArr, rhoArr)
+        # sort rows by top depth; for the common case -- loading a contiguous
+        # stack of layers into an empty model -- everything goes in with one
+        # batched append instead of N general-case addlayer rebuilds
+        isort   = np.argsort(z0Arr, kind='stable')
+        z0Arr   = z0Arr[isort]; HArr = HArr[isort]
+        vsArr   = vsArr[isort]; vpArr = vpArr[isort]; rhoArr = rhoArr[isort]
+        zbArr   = np.cumsum(HArr)
+        if self._data.shape[0] == 0 and np.allclose(z0Arr, zbArr-HArr):
+            self.addlayers(HArr=HArr, vsvArr=vsArr, vpvArr=vpArr, rhoArr=rhoArr)
+        else:
+            for i in range(z0Arr.size):
+                self.addlayer( H=HArr[i], vsv=vsArr[i], vpv=vpArr[i], rho=rhoArr[i], zmin=z0Arr[i])
         return
     
     def perturb(self, dm, zmin=0, zmax=9999, datatype='vs'):
@@ -722,279 +629,111 @@ class Model1d(object):
         if (datatype == 'vsv' or datatype == 'vpv' or datatype == 'vsh' or datatype == 'vph' or datatype == 'vpf') \
                 and self.modeltype != 'TRANSVERSE ISOTROPIC':
             raise ValueError('datatype of vpv/vsv/vph/vsh is not accepted when model is not TI !')
-        topArr      = self.DepthArr - self.HArr
+        topArr      = self.topArr
         bottomArr   = self.DepthArr
-        indexArr    = np.arange(self.HArr.size)
-        indexT      = topArr >= zmin
-        indexB      = bottomArr <= zmax
-        if np.any(topArr == zmin): Ht = 0.
+        # depths are monotone, so the boundary layers are located with binary
+        # searches instead of allocating boolean masks over the whole model
+        it0         = np.searchsorted(topArr, zmin, side='left')
+        it1         = np.searchsorted(topArr, zmin, side='right')
+        if it0 != it1: Ht = 0.      # zmin coincides with a layer top
         else:
-            print 'Will add top layer !'
-            Ht      = ( topArr [topArr >zmin ]) [0] - zmin
-            indext  = (indexArr [indexT])[0] - 1
+            print('Will add top layer !')
+            Ht      = topArr[it1] - zmin
+            indext  = it0 - 1
             z1      = zmin
-        if np.any(bottomArr == zmax): Hb = 0.
+        ib0         = np.searchsorted(bottomArr, zmax, side='left')
+        ib1         = np.searchsorted(bottomArr, zmax, side='right')
+        if ib0 != ib1: Hb = 0.      # zmax coincides with a layer bottom
         else:
-            print 'Will add bottom layer !'
-            if zmax < bottomArr [0]:
+            print('Will add bottom layer !')
+            if zmax < bottomArr[0]:
                 Hb      = zmax
                 indexb  = 0
                 z2      = 0.
             else:
-                Hb      = zmax - ( bottomArr[bottomArr < zmax ]) [-1]
-                indexb  = (indexArr [indexB])[-1] + 1
-                z2      = ( bottomArr [bottomArr < zmax ]) [-1]
-        index   = indexT*indexB
-        if datatype == 'vp':
-            self.VpArr[index]=self.VpArr[index]*(1.+dm)
-            if Hb != 0:
-                self.addlayer(H=Hb, vsv=self.VsArr[indexb], vpv=self.VpArr[indexb]*(1.+dm), rho=self.rhoArr[indexb],
-                        Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                            frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-            if Ht != 0.:
-                self.addlayer(H=Ht, vsv=self.VsArr[indext], vpv=self.VpArr[indext]*(1.+dm), rho=self.rhoArr[indext],
-                        Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                            frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-                
-        if datatype=='vs':
-            self.VsArr[index]=self.VsArr[index]*(1.+dm)
-            if Hb !=0:
-                self.addlayer(H=Hb, vsv=self.VsArr[indexb]*(1.+dm), vpv=self.VpArr[indexb], rho=self.rhoArr[indexb],
-                        Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                            frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-            if Ht !=0.:
-                self.addlayer(H=Ht, vsv=self.VsArr[indext]*(1.+dm), vpv=self.VpArr[indext], rho=self.rhoArr[indext],
-                        Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                            frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-                
-        if datatype == 'vpv':
-            self.VpvArr[index]=self.VpvArr[index]*(1.+dm)
-            if Hb != 0:
-                self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb]*(1.+dm), vsh=self.VshArr[indexb],
-                    vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                        Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                            frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-            if Ht != 0.:
-                self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext]*(1.+dm), vsh=self.VshArr[indext],
-                    vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                        Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                            frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-                
-        if datatype == 'vph':
-            self.VphArr[index]=self.VphArr[index]*(1.+dm)
-            if Hb != 0:
-                self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                    vph=self.VphArr[indexb]*(1.+dm), vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                        Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                            frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-            if Ht != 0.:
-                self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                    vph=self.VphArr[indext]*(1.+dm), vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                        Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                            frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-                
-        if datatype == 'vsv':
-            self.VsvArr[index]=self.VsvArr[index]*(1.+dm)
-            if Hb != 0:
-                self.addlayer(H=Hb, vsv=self.VsvArr[indexb]*(1.+dm), vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                    vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                        Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                            frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-            if Ht != 0.:
-                self.addlayer(H=Ht, vsv=self.VsvArr[indext]*(1.+dm), vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                    vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                        Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                            frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-                
-        if datatype == 'vsh':
-            self.VshArr[index]=self.VshArr[index]*(1.+dm)
-            if Hb != 0:
-                self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb]*(1.+dm),
-                    vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                        Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                            frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-            if Ht != 0.:
-                self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext]*(1.+dm),
-                    vph=self.VphArr[indext]*(1.+dm), vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                        Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                            frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-                
-        if datatype == 'vpf':
-            self.VpfArr[index]=self.VpfArr[index]*(1.+dm)
-            if Hb != 0:
-                self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                    vph=self.VphArr[indexb], vpf=self.VpfArr[indexb]*(1.+dm), rho=self.rhoArr[indexb],
-                        Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                            frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-            if Ht != 0.:
-                self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                    vph=self.VphArr[indext], vpf=self.VpfArr[indext]*(1.+dm), rho=self.rhoArr[indext],
-                        Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                            frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-        if self.modeltype == 'ISOTROPIC':
-            if datatype=='rho':
-                self.rhoArr[index]=self.rhoArr[index]*(1.+dm)
-                if Hb !=0:
-                    self.addlayer(H=Hb, vsv=self.VsArr[indexb], vpv=self.VpArr[indexb], rho=self.rhoArr[indexb]*(1.+dm),
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht !=0.:
-                    self.addlayer(H=Ht, vsv=self.VsArr[indext], vpv=self.VpArr[indext], rho=self.rhoArr[indext]*(1.+dm),
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='qp':
-                self.QpArr[index]=self.QpArr[index]*(1.+dm)
-                if Hb !=0:
-                    self.addlayer(H=Hb, vsv=self.VsArr[indexb], vpv=self.VpArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb]*(1.+dm), Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht !=0.:
-                    self.addlayer(H=Ht, vsv=self.VsArr[indext], vpv=self.VpArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext]*(1.+dm), Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='qs':
-                self.QsArr[index]=self.QsArr[index]*(1.+dm)
-                if Hb !=0:
-                    self.addlayer(H=Hb, vsv=self.VsArr[indexb], vpv=self.VpArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb]*(1.+dm), etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht !=0.:
-                    self.addlayer(H=Ht, vsv=self.VsArr[indext], vpv=self.VpArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext]*(1.+dm), etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='etap':
-                self.etapArr[index]=self.etapArr[index]*(1.+dm)
-                if Hb !=0:
-                    self.addlayer(H=Hb, vsv=self.VsArr[indexb], vpv=self.VpArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb]*(1.+dm), etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht !=0.:
-                    self.addlayer(H=Ht, vsv=self.VsArr[indext], vpv=self.VpArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext]*(1.+dm), etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='etas':
-                self.etasArr[index]=self.etasArr[index]*(1.+dm)
-                if Hb !=0:
-                    self.addlayer(H=Hb, vsv=self.VsArr[indexb], vpv=self.VpArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb]*(1.+dm),
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht !=0.:
-                    self.addlayer(H=Ht, vsv=self.VsArr[indext], vpv=self.VpArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext]*(1.+dm),
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='frefp':
-                self.frefpArr[index]=self.frefpArr[index]*(1.+dm)
-                if Hb !=0:
-                    self.addlayer(H=Hb, vsv=self.VsArr[indexb], vpv=self.VpArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb]*(1.+dm), frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht !=0.:
-                    self.addlayer(H=Ht, vsv=self.VsArr[indext], vpv=self.VpArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext]*(1.+dm), frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='frefs':
-                self.frefsArr[index]=self.frefsArr[index]*(1.+dm)
-                if Hb !=0:
-                    self.addlayer(H=Hb, vsv=self.VsArr[indexb], vpv=self.VpArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb]*(1.+dm), zmin=z2)
-                if Ht !=0.:
-                    self.addlayer(H=Ht, vsv=self.VsArr[indext], vpv=self.VpArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext]*(1.+dm), zmin=z1)
-        elif self.modeltype == 'TRANSVERSE ISOTROPIC':
-            if datatype=='rho':
-                self.rhoArr[index]=self.rhoArr[index]*(1.+dm)
-                if Hb != 0:
-                    self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                        vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb]*(1.+dm),
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht != 0.:
-                    self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                        vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext]*(1.+dm),
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='qp':
-                self.QpArr[index]=self.QpArr[index]*(1.+dm)
-                if Hb != 0:
-                    self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                        vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb]*(1.+dm), Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht != 0.:
-                    self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                        vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext]*(1.+dm), Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='qs':
-                self.QsArr[index]=self.QsArr[index]*(1.+dm)
-                if Hb != 0:
-                    self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                        vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb]*(1.+dm), etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht != 0.:
-                    self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                        vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext]*(1.+dm), etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='etap':
-                self.etapArr[index]=self.etapArr[index]*(1.+dm)
-                if Hb != 0:
-                    self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                        vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb]*(1.+dm), etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht != 0.:
-                    self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                        vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext]*(1.+dm), etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='etas':
-                self.etasArr[index]=self.etasArr[index]*(1.+dm)
-                if Hb != 0:
-                    self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                        vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb]*(1.+dm),
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht != 0.:
-                    self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                        vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext]*(1.+dm),
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='frefp':
-                self.frefpArr[index]=self.frefpArr[index]*(1.+dm)
-                if Hb != 0:
-                    self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                        vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb]*(1.+dm), frefs=self.frefsArr[indexb], zmin=z2)
-                if Ht != 0.:
-                    self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                        vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext]*(1.+dm), frefs=self.frefsArr[indext], zmin=z1)
-            if datatype=='frefs':
-                self.frefsArr[index]=self.frefsArr[index]*(1.+dm)
-                if Hb != 0:
-                    self.addlayer(H=Hb, vsv=self.VsvArr[indexb], vpv=self.VpvArr[indexb], vsh=self.VshArr[indexb],
-                        vph=self.VphArr[indexb], vpf=self.VpfArr[indexb], rho=self.rhoArr[indexb],
-                            Qp=self.QpArr[indexb], Qs=self.QsArr[indexb], etap=self.etapArr[indexb], etas=self.etasArr[indexb],
-                                frefp=self.frefpArr[indexb], frefs=self.frefsArr[indexb]*(1.+dm), zmin=z2)
-                if Ht != 0.:
-                    self.addlayer(H=Ht, vsv=self.VsvArr[indext], vpv=self.VpvArr[indext], vsh=self.VshArr[indext],
-                        vph=self.VphArr[indext], vpf=self.VpfArr[indext], rho=self.rhoArr[indext],
-                            Qp=self.QpArr[indext], Qs=self.QsArr[indext], etap=self.etapArr[indext], etas=self.etasArr[indext],
-                                frefp=self.frefpArr[indext], frefs=self.frefsArr[indext]*(1.+dm), zmin=z1)
+                z2      = bottomArr[ib0-1]
+                Hb      = zmax - z2
+                indexb  = ib1
+        try:
+            attr, kw    = self._PERTURB_MAP[datatype]
+        except KeyError:
+            raise ValueError('Unexpected datatype: '+datatype)
+        scale       = 1.+dm
+        _scale_column(self._data, self._cols[attr], it0, ib1, scale)
+        # rebuild the straddling partial layers from one row of parameters
+        # each, scaling only the perturbed one; the bottom layer goes in first
+        # so the cached top index stays valid
+        jobs        = []
+        if Hb != 0: jobs.append((Hb, indexb, z2))
+        if Ht != 0: jobs.append((Ht, indext, z1))
+        for Hx, ix, zx in jobs:
+            kwargs      = self._row_kwargs(ix)
+            kwargs[kw]  = kwargs[kw]*scale
+            self.addlayer(H=Hx, zmin=zx, **kwargs)
         return
     
+    def getArr4plot(self, zmin=0., zmax=9999., datatype='vs'):
+        """
+        Get data and depth arrays for a staircase plot of the given parameter
+        =======================================================
+        Input Parameters:
+        zmin, zmax  - depth range, (zmin, zmax]
+        datatype    - data type (same keys as perturb)
+        Output:
+        dataArr, depthArr - arrays ready for plt.plot
+        =======================================================
+        """
+        try:
+            attr, _ = self._PERTURB_MAP[datatype]
+        except KeyError:
+            raise ValueError('Unexpected datatype: '+datatype)
+        # DepthArr is monotone, so the (zmin, zmax] window is a contiguous
+        # slice: two binary searches and zero-copy views instead of a boolean
+        # mask plus two gathered copies
+        lo          = np.searchsorted(self.DepthArr, zmin, side='right')
+        hi          = np.searchsorted(self.DepthArr, zmax, side='right')
+        dataArr     = getattr(self, attr)[lo:hi]
+        depthArr    = self.DepthArr[lo:hi]
+        # write the staircase points straight into two preallocated buffers
+        # with strided assignment; repeat+append would allocate four
+        # intermediate copies of the same data
+        N           = dataArr.size
+        outdata     = np.empty(2*N+1)
+        outdata[0:2*N:2]    = dataArr
+        outdata[1:2*N:2]    = dataArr
+        outdata[2*N]        = dataArr[-1]
+        outdepth    = np.empty(2*N+1)
+        outdepth[0]         = 0.
+        outdepth[1:2*N:2]   = depthArr
+        outdepth[2:2*N+1:2] = depthArr
+        return outdata, outdepth
+
+    def plotvsak135(self, zmin=0., zmax=9999., datatype='vs', newfig=True, showfig=True):
+        """
+        Plot the model against ak135 for the given parameter
+        """
+        dataArr0, depthArr0 = _ak135_plot_arrays(self._modelindex, zmin, zmax, datatype)
+        dataArr, depthArr   = self.getArr4plot(zmin=zmin, zmax=zmax, datatype=datatype)
+        if newfig: fig, ax=plt.subplots()
+        plt.plot(dataArr0, depthArr0, 'k-', lw=3, label='ak135')
+        plt.plot(dataArr, depthArr, 'r-', lw=3, label=self.modelname)
+        if newfig:
+            ax.tick_params(axis='x', labelsize=20)
+            ax.tick_params(axis='y', labelsize=20)
+            plt.gca().invert_yaxis()
+            plt.xlabel(datatype.upper(), fontsize=30)
+            plt.ylabel('Depth (km)', fontsize=30)
+        if showfig:
+            plt.legend(numpoints=1, fontsize=20, loc=0)
+            plt.show()
+        return
+
     def read_axisem_bm(self, infname):
         """
         Read 1D block model from AxiSEM
         """
         self.earthtype  = 'SPHERICAL EARTH'
-        with open(infname, 'rb') as f:
+        with open(infname, 'r') as f:
             f.readline()
             cline           = f.readline()
             cline           = cline.split()
@@ -1008,18 +747,13 @@ class Model1d(object):
                 raise ValueError('Unexpected header: '+cline[0])
             anisotropic     = cline[1]
             if anisotropic == 'T':
-                self.modeltype  = 'TRANSVERSE ISOTROPIC'
-                self.modelheader= '\tH(KM)\tVPV(KM/S)\tVSV(KM/S)\tRHO(GM/CC)\tQP\tQS\tETAP\tETAS\tFREFP\tFREFS\n\tVPH(KM/S)\tVSH(KM/S)\tVPF(KM/S)'
-                self.VsvArr     = np.array([])
-                self.VpvArr     = np.array([])
-                self.VshArr     = np.array([])
-                self.VphArr     = np.array([])
-                self.VpfArr     = np.array([])
+                self._set_modeltype('TRANSVERSE ISOTROPIC')
             elif anisotropic == 'F':
-                self.modeltype  = 'ISOTROPIC'
-                self.modelheader= '\tH(KM)\tVP(KM/S)\tVS(KM/S)\tRHO(GM/CC)\tQP\tQS\tETAP\tETAS\tFREFP\tFREFS'
-                self.VsArr      = np.array([])
-                self.VpArr      = np.array([])
+                self._set_modeltype('ISOTROPIC')
+            # grow Python lists during the scan; lists append in amortized O(1),
+            # while np.append reallocates the whole array every line
+            HArr    = []; rhoArr  = []; QpArr   = []; QsArr   = []
+            VsvArr  = []; VpvArr  = []; VshArr  = []; VphArr  = []; VpfArr  = []
             cline           = f.readline()
             cline           = cline.split()
             if cline[0] != 'UNITS':
@@ -1045,7 +779,7 @@ class Model1d(object):
                 r   = float(cline[ ind['radius'] ])/unit
                 z   = 6371. - r
                 H   = z - z0
-                # # # print ' '.join(cline), H
+                # # # print(' ').join(cline), H
                 if H == 0.:
                     vpvt = float(cline[ ind['vpv'] ])/unit
                     vsvt = float(cline[ ind['vsv'] ])/unit
@@ -1077,19 +811,16 @@ class Model1d(object):
                     vshb = float(cline[ ind['vsh'] ])/unit
                     etab = float(cline[ ind['eta'] ])/unit
                     vpfb = np.sqrt(etab*(vphb**2 - vsvb**2))
-                self.HArr   = np.append(self.HArr, H)
-                self.rhoArr = np.append(self.rhoArr, (rhot+rhob)/2.)
-                self.QpArr  = np.append(self.QpArr, (qpt+qpb)/2.)
-                self.QsArr  = np.append(self.QsArr, (qmut+qmub)/2.)
+                HArr.append(H)
+                rhoArr.append((rhot+rhob)/2.)
+                QpArr.append((qpt+qpb)/2.)
+                QsArr.append((qmut+qmub)/2.)
+                VsvArr.append((vsvt+vsvb)/2.)
+                VpvArr.append((vpvt+vpvb)/2.)
                 if anisotropic == 'T':
-                    self.VsvArr = np.append(self.VsvArr, (vsvt+vsvb)/2.)
-                    self.VshArr = np.append(self.VshArr, (vsht+vshb)/2.)
-                    self.VpvArr = np.append(self.VpvArr, (vpvt+vpvb)/2.)
-                    self.VphArr = np.append(self.VphArr, (vpht+vphb)/2.)
-                    self.VpfArr = np.append(self.VpfArr, (vpft+vpfb)/2.)
-                else:
-                    self.VsArr = np.append(self.VsArr, (vsvt+vsvb)/2.)
-                    self.VpArr = np.append(self.VpArr, (vpvt+vpvb)/2.)
+                    VshArr.append((vsht+vshb)/2.)
+                    VphArr.append((vpht+vphb)/2.)
+                    VpfArr.append((vpft+vpfb)/2.)
                 # # # print vsvt, vsvb, (vsvt+vsvb)/2.
                 z0      = z
                 vpvt    = vpvb
@@ -1103,15 +834,20 @@ class Model1d(object):
                     vsht = vshb
                     etat = etab
                     vpft = vpfb
-        self.etapArr    = np.zeros(self.HArr.size)
-        self.etasArr    = np.zeros(self.HArr.size)
-        self.frefpArr   = np.ones(self.HArr.size)
-        self.frefsArr   = np.ones(self.HArr.size)
-        self.DepthArr   = np.cumsum(self.HArr)
+        HArr        = np.asarray(HArr, dtype=float)
+        if self.modeltype == 'ISOTROPIC':
+            fielddict   = {'VpArr': np.asarray(VpvArr), 'VsArr': np.asarray(VsvArr)}
+        elif self.modeltype == 'TRANSVERSE ISOTROPIC':
+            fielddict   = {'VpvArr': np.asarray(VpvArr), 'VsvArr': np.asarray(VsvArr), 'VphArr': np.asarray(VphArr),
+                    'VshArr': np.asarray(VshArr), 'VpfArr': np.asarray(VpfArr)}
+        fielddict.update({'HArr': HArr, 'rhoArr': np.asarray(rhoArr), 'QpArr': np.asarray(QpArr), 'QsArr': np.asarray(QsArr),
+                'etapArr': np.zeros(HArr.size), 'etasArr': np.zeros(HArr.size),
+                'frefpArr': np.ones(HArr.size), 'frefsArr': np.ones(HArr.size)})
+        self._assemble(fielddict)
         return
     
     def write_axisem_bm(self, outfname, noq=True, modelname='model_cps', comment='Model from CPS', unit=1000.):
-        with open(outfname, 'wb') as f:
+        with open(outfname, 'w') as f:
             ###
             # header
             ###
@@ -1136,8 +872,8 @@ class Model1d(object):
             # model parameters
             ###
             N   = self.HArr.size
-            topArr  = self.DepthArr - self.HArr
-            for i in xrange(N):
+            topArr  = self.topArr
+            for i in range(N):
                 z0  = topArr[i]; z1 = self.DepthArr[i]
                 r0  = (6371.-z0)*unit; r1 = (6371.-z1)*unit
                 rho = self.rhoArr[i]*unit
@@ -1174,7 +910,108 @@ class Model1d(object):
         
                     
 
-    
+
+class IsotropicModel1d(Model1d):
+    """
+    Model1d specialized for isotropic models; Model1d(modelindex=1) returns this type
+    """
+    _modelindex = 1
+    modeltype   = 'ISOTROPIC'
+    modelheader = '\tH(KM)\tVP(KM/S)\tVS(KM/S)\tRHO(GM/CC)\tQP\tQS\tETAP\tETAS\tFREFP\tFREFS'
+    _cols       = Model1d._COLS_ISO
+
+    def _velfielddict(self, VpArr, VsArr):
+        return {'VpArr': VpArr, 'VsArr': VsArr}
+
+    def _vellayer(self, vpv, vsv, vph, vsh, vpf):
+        return {'VpArr': vpv, 'VsArr': vsv}
+
+    def _velkwargs(self, i):
+        return {'vsv': self.VsArr[i], 'vpv': self.VpArr[i]}
+
+    def _writearr(self):
+        # matrix column order matches the file layout
+        return '%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f', self._data
+
+    def _parse_body(self, lines):
+        inArr   = np.loadtxt(lines, ndmin=2)
+        return {'HArr': inArr[:,0], 'VpArr': inArr[:,1], 'VsArr': inArr[:,2], 'rhoArr': inArr[:,3],
+                'QpArr': inArr[:,4], 'QsArr': inArr[:,5], 'etapArr': inArr[:,6], 'etasArr': inArr[:,7],
+                'frefpArr': inArr[:,8], 'frefsArr': inArr[:,9]}
+
+
+class TIModel1d(Model1d):
+    """
+    Model1d specialized for transversely isotropic models; Model1d(modelindex=2) returns this type
+    """
+    _modelindex = 2
+    modeltype   = 'TRANSVERSE ISOTROPIC'
+    modelheader = '\tH(KM)\tVPV(KM/S)\tVSV(KM/S)\tRHO(GM/CC)\tQP\tQS\tETAP\tETAS\tFREFP\tFREFS\n\tVPH(KM/S)\tVSH(KM/S)\tVPF(KM/S)'
+    _cols       = Model1d._COLS_TI
+
+    def _velfielddict(self, VpArr, VsArr):
+        if VsArr.size == 0 or VpArr.size == 0 or VsArr.size != VpArr.size:
+            VpfArr  = np.array([])
+        else:
+            VpfArr  = _vpf(VpArr, VsArr)
+        return {'VpvArr': VpArr, 'VsvArr': VsArr, 'VphArr': VpArr, 'VshArr': VsArr, 'VpfArr': VpfArr}
+
+    def _vellayer(self, vpv, vsv, vph, vsh, vpf):
+        return {'VpvArr': vpv, 'VsvArr': vsv, 'VphArr': vph, 'VshArr': vsh, 'VpfArr': vpf}
+
+    def _velkwargs(self, i):
+        return {'vsv': self.VsvArr[i], 'vpv': self.VpvArr[i], 'vsh': self.VshArr[i],
+                'vph': self.VphArr[i], 'vpf': self.VpfArr[i]}
+
+    def _writearr(self):
+        outstr  = '%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\t%f\n\t\t%f\t%f\t%f'
+        outArr  = np.column_stack((self.HArr, self.VpvArr, self.VsvArr, self.rhoArr, self.QpArr, self.QsArr,
+                    self.etapArr, self.etasArr, self.frefpArr, self.frefsArr, self.VphArr, self.VshArr, self.VpfArr))
+        return outstr, outArr
+
+    def _parse_body(self, lines):
+        # TI models use two-line records: odd lines hold H/Vpv/Vsv/..., even lines Vph/Vsh/Vpf
+        inArr1  = np.loadtxt(lines[0::2], ndmin=2)
+        inArr2  = np.loadtxt(lines[1::2], ndmin=2)
+        return {'HArr': inArr1[:,0], 'VpvArr': inArr1[:,1], 'VsvArr': inArr1[:,2], 'rhoArr': inArr1[:,3],
+                'QpArr': inArr1[:,4], 'QsArr': inArr1[:,5], 'etapArr': inArr1[:,6], 'etasArr': inArr1[:,7],
+                'frefpArr': inArr1[:,8], 'frefsArr': inArr1[:,9],
+                'VphArr': inArr2[:,0], 'VshArr': inArr2[:,1], 'VpfArr': inArr2[:,2]}
+
+
+_ak135_plot_cache   = {}
+
+def _ak135_plot_arrays(modelindex, zmin, zmax, datatype):
+    """
+    Memoized ak135 staircase arrays for plotvsak135: the reference model is
+    built and windowed once per (model type, depth window, datatype).  The
+    cached arrays are marked read-only since every caller shares them.
+    """
+    key = (modelindex, zmin, zmax, datatype)
+    if key not in _ak135_plot_cache:
+        refmodel    = Model1d(modelindex=modelindex)
+        refmodel.ak135()
+        dataArr, depthArr   = refmodel.getArr4plot(zmin=zmin, zmax=zmax, datatype=datatype)
+        dataArr.setflags(write=False)
+        depthArr.setflags(write=False)
+        _ak135_plot_cache[key]  = (dataArr, depthArr)
+    return _ak135_plot_cache[key]
+
+
+def _profileparam(name):
+    """
+    Property factory for vprofile attribute arrays; reads flush any rows still
+    buffered by add() so callers always see a plain ndarray
+    """
+    def _get(self):
+        self._flush()
+        return self._arrs[name]
+    def _set(self, value):
+        self._flush()
+        self._arrs[name] = np.asarray(value, dtype=float)
+    return property(_get, _set)
+
+
 class vprofile(object):
     def __init__(self, vsArr=np.array([]), vpArr=np.array([]), rhoArr=np.array([]), RmaxArr=np.array([]), RminArr=np.array([]),
                  z0Arr=np.array([]), HArr=np.array([]), xArr=np.array([]), yArr=np.array([]), dtypeArr=np.array([]), infname=None ):
@@ -1190,6 +1027,8 @@ class vprofile(object):
         1. percentage value for dvs/dvp/drho 
         ========================================================================================
         """
+        self._arrs      = {}
+        self._pending   = []
         self.vsArr      = vsArr
         self.vpArr      = vpArr
         self.rhoArr     = rhoArr
@@ -1203,61 +1042,71 @@ class vprofile(object):
         if infname != None:
             self.read(infname=infname)
         return
+
+    # attribute order matches the text-file column order
+    _PROFKEYS   = ('vsArr', 'vpArr', 'rhoArr', 'RmaxArr', 'RminArr', 'z0Arr', 'HArr', 'xArr', 'yArr', 'dtypeArr')
+    vsArr       = _profileparam('vsArr')
+    vpArr       = _profileparam('vpArr')
+    rhoArr      = _profileparam('rhoArr')
+    RmaxArr     = _profileparam('RmaxArr')
+    RminArr     = _profileparam('RminArr')
+    z0Arr       = _profileparam('z0Arr')
+    HArr        = _profileparam('HArr')
+    xArr        = _profileparam('xArr')
+    yArr        = _profileparam('yArr')
+    dtypeArr    = _profileparam('dtypeArr')
+
+    def _flush(self):
+        """
+        Materialize rows buffered by add() with one concatenation per attribute
+        """
+        if not self._pending: return
+        block           = np.asarray(self._pending, dtype=float)
+        self._pending   = []
+        for i, key in enumerate(self._PROFKEYS):
+            self._arrs[key] = np.concatenate((self._arrs[key], block[:, i]))
+        return
     
     def read(self, infname):
-        inArr=np.loadtxt(infname)
-        try:
-            self.vsArr      = inArr[:,0]
-            self.vpArr      = inArr[:,1]
-            self.rhoArr     = inArr[:,2]
-            self.RmaxArr    = inArr[:,3]
-            self.RminArr    = inArr[:,4]
-            self.z0Arr      = inArr[:,5]
-            self.HArr       = inArr[:,6]
-            self.xArr       = inArr[:,7]
-            self.yArr       = inArr[:,8]
-            self.dtypeArr   = inArr[:,9]
-        except:
-            self.vsArr      = np.array([inArr[0]])
-            self.vpArr      = np.array([inArr[1]])
-            self.rhoArr     = np.array([inArr[2]])
-            self.RmaxArr    = np.array([inArr[3]])
-            self.RminArr    = np.array([inArr[4]])
-            self.z0Arr      = np.array([inArr[5]])
-            self.HArr       = np.array([inArr[6]])
-            self.xArr       = np.array([inArr[7]])
-            self.yArr       = np.array([inArr[8]])
-            self.dtypeArr   = np.array([inArr[9]])
+        # keep a binary sibling of the text file, as for the ak135 database:
+        # np.load skips the float tokenizer whenever the .npz is at least as
+        # new as the text file
+        npzfname    = infname + '.npz'
+        if os.path.isfile(npzfname) and os.path.getmtime(npzfname) >= os.path.getmtime(infname):
+            data    = np.load(npzfname)
+            for key in self._PROFKEYS:
+                setattr(self, key, data[key])
+        else:
+            # unpack=True hands back ready-split columns in one pass, and ndmin=2
+            # makes single-row files come out as length-1 columns, which removes
+            # the old scalar-vs-array fallback branch
+            (self.vsArr, self.vpArr, self.rhoArr, self.RmaxArr, self.RminArr,
+                self.z0Arr, self.HArr, self.xArr, self.yArr, self.dtypeArr) = np.loadtxt(infname, unpack=True, ndmin=2)
+            try:
+                np.savez(npzfname, **dict((key, getattr(self, key)) for key in self._PROFKEYS))
+            except (IOError, OSError):
+                pass    # read-only directory; fall back to parsing each run
+        self.check()
         return
     
     def write(self, outfname):
-        N       = self.vsArr.size
-        outArr  = np.append(self.vsArr, self.vpArr)
-        outArr  = np.append(outArr, self.rhoArr)
-        outArr  = np.append(outArr, self.RmaxArr)
-        outArr  = np.append(outArr, self.RminArr)
-        outArr  = np.append(outArr, self.z0Arr)
-        outArr  = np.append(outArr, self.HArr)
-        outArr  = np.append(outArr, self.xArr)
-        outArr  = np.append(outArr, self.yArr)
-        outArr  = np.append(outArr, self.dtypeArr)
-        outArr  = outArr.reshape(10, N)
-        outArr  = outArr.T
+        # one column stack instead of nine growing np.append calls plus a
+        # reshape/transpose of the whole block
+        outArr  = np.column_stack((self.vsArr, self.vpArr, self.rhoArr, self.RmaxArr, self.RminArr,
+                    self.z0Arr, self.HArr, self.xArr, self.yArr, self.dtypeArr))
         self.check()
         np.savetxt(outfname, outArr, fmt='%g', header='vs/dvs vp/dvp rho/drho Rmax Rmin z0 H x y dtype(0: m, 1: dm)')
         return
     
     def check(self):
-        N = self.vsArr.size
-        for i in xrange(N):
-            x       = self.xArr[i]
-            y       = self.yArr[i]
-            Rmax    = self.RmaxArr[i]
-            H       = self.HArr[i]
-            index   = (self.xArr==x)* (self.yArr==y) * (self.RmaxArr==Rmax) * (self.HArr==H)
-            if np.any(index):
-                warnings.warn('Profile of same geometry and location exists.', UserWarning, stacklevel=1)
-                return
+        """
+        Warn if two profiles share the same geometry and location (x, y, Rmax, H)
+        """
+        keys        = np.column_stack((self.xArr, self.yArr, self.RmaxArr, self.HArr))
+        if keys.shape[0] < 2: return
+        _, counts   = np.unique(keys, axis=0, return_counts=True)
+        if np.any(counts > 1):
+            warnings.warn('Profile of same geometry and location exists.', UserWarning, stacklevel=1)
         return
     
     def add(self, Rmax, Rmin, z0, H, x, y, dtype, vs=None, vp=None, rho=None):
@@ -1298,7 +1147,13 @@ class vprofile(object):
             if not isinstance(rho, np.ndarray):
                 rho     = np.ones(N)*rho
         else:
-            index       = (self.xArr==x)* (self.yArr==y) * (self.RmaxArr==Rmax) * (self.HArr==H)
+            # combine the key comparisons with logical_and into one reused
+            # bool buffer; * on bool arrays works but allocates an int product
+            # per pair
+            index       = np.equal(self.xArr, x)
+            np.logical_and(index, self.yArr == y, out=index)
+            np.logical_and(index, self.RmaxArr == Rmax, out=index)
+            np.logical_and(index, self.HArr == H, out=index)
             # change model parameters if profile with same geometry/location exist
             if np.any(index):
                 if vs !=None:
@@ -1316,6 +1171,10 @@ class vprofile(object):
                 vp  = 0.
             if rho == None:
                 rho = 0.
+            # buffer the scalar row; _flush materializes all buffered rows at
+            # once, so building a profile of N entries stays O(N)
+            self._pending.append((vs, vp, rho, Rmax, Rmin, z0, H, x, y, dtype))
+            return
         self.vsArr      = np.append( self.vsArr, vs)
         self.vpArr      = np.append( self.vpArr, vp)
         self.rhoArr     = np.append( self.rhoArr, rho)